@@ -0,0 +1,296 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+# 본문 최대 크기 (trafilatura MAX_FILE_SIZE와 동일, 초과 시 다운로드 중단)
+MAX_BODY_BYTES = 20 * 1024 * 1024
+# 캐시/추출 대상 Content-Type (헤더가 없으면 HTML로 간주)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+def is_html(content_type: str) -> bool:
+    """Content-Type 헤더가 HTML인지 확인"""
+    if not content_type:
+        return True
+    return content_type.split(';')[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+class HttpCache:
+    """뉴스레터/실행 간 공유하는 디스크 HTTP 응답 캐시
+
+    본문은 SHA-256 기준으로 bodies/에 한 번만 저장하고(content-addressed),
+    URL별 ETag/Last-Modified는 index.db에 저장해 조건부 GET으로 재검증.
+    fresh_hours 이내 응답은 네트워크 요청 없이 재사용.
+    요청은 하나의 Session으로 연결을 재사용하고 429/5xx는 backoff 후 재시도하며,
+    HTML이 아닌 응답과 MAX_BODY_BYTES를 넘는 본문은 저장하지 않음.
+    Google News 디코딩 결과(원문 URL)도 같은 DB에 저장해 재사용.
+    """
+
+    def __init__(self, cache_dir: str = '.cache/http', fresh_hours: float = 12,
+                 max_age_days: float = 14, max_size_mb: float = 500,
+                 timeout: int = 30, user_agent: str = DEFAULT_USER_AGENT,
+                 max_body_bytes: int = MAX_BODY_BYTES, retries: int = 3, pool_size: int = 10):
+        self.cache_dir = cache_dir
+        self.bodies_dir = os.path.join(cache_dir, 'bodies')
+        self.db_path = os.path.join(cache_dir, 'index.db')
+        self.fresh_seconds = fresh_hours * 3600
+        self.max_age_seconds = max_age_days * 86400
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_body_bytes = max_body_bytes
+        self.lock = threading.Lock()
+        self.stats = {
+            'requests': 0, 'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'errors': 0, 'skipped': 0,
+            'bytes_saved': 0, 'bytes_downloaded': 0, 'decode_requests': 0, 'decode_hits': 0
+        }
+
+        # 스레드 간 공유 (연결 풀 재사용), 429/5xx는 Retry-After 또는 지수 backoff 후 재시도
+        retry = Retry(
+            total=retries, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'], respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        with self.lock:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body_hash TEXT,
+                    size INTEGER,
+                    content_type TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL,
+                    accessed_at REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS decoded_urls (
+                    source_url TEXT PRIMARY KEY,
+                    decoded_url TEXT,
+                    created_at REAL
+                )
+            ''')
+            conn.commit()
+            conn.close()
+
+    @classmethod
+    def from_config(cls, common_config: Dict) -> 'HttpCache':
+        """config.yaml common.http_cache 설정으로 생성"""
+        cache_config = common_config.get('http_cache') or {}
+        return cls(
+            cache_dir=cache_config.get('dir', '.cache/http'),
+            fresh_hours=cache_config.get('fresh_hours', 12),
+            max_age_days=cache_config.get('max_age_days', 14),
+            max_size_mb=cache_config.get('max_size_mb', 500)
+        )
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.bodies_dir, body_hash[:2], body_hash)
+
+    def _count(self, key: str, value: int = 1):
+        with self.lock:
+            self.stats[key] += value
+
+    def _execute(self, query: str, params: tuple = ()) -> list:
+        """DB 쿼리 실행 (스레드 간 직렬화)"""
+        with self.lock:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            conn.commit()
+            conn.close()
+        return rows
+
+    def _read_body(self, body_hash: str) -> bytes:
+        try:
+            with open(self._body_path(body_hash), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_body(self, body: bytes) -> str:
+        """본문 저장 (같은 내용은 한 번만 저장), 해시 반환"""
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        return body_hash
+
+    def _get(self, url: str, headers: Dict) -> requests.Response:
+        """스트리밍 GET 요청 (인증서 오류 시 검증 없이 재시도), 호출 측에서 close"""
+        try:
+            return self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        except requests.exceptions.SSLError:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            return self.session.get(url, headers=headers, timeout=self.timeout, stream=True, verify=False)
+
+    def _read_response(self, response: requests.Response) -> bytes:
+        """응답 본문 읽기 (max_body_bytes 초과 시 중단하고 None)"""
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            return None
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def fetch(self, url: str) -> bytes:
+        """URL 본문 조회 (캐시 우선, 만료 시 조건부 GET), 실패 시 None"""
+        self._count('requests')
+        now = time.time()
+        rows = self._execute(
+            "SELECT body_hash, size, etag, last_modified, fetched_at, content_type FROM responses WHERE url = ?",
+            (url,)
+        )
+        # HTML이 아닌 항목(형식 확인 도입 전 저장분)은 캐시로 쓰지 않고 다시 요청
+        cached = rows[0] if rows and is_html(rows[0][5]) else None
+        body = self._read_body(cached[0]) if cached else None
+
+        # 신선한 캐시는 네트워크 요청 없이 반환
+        if body is not None and now - cached[4] < self.fresh_seconds:
+            self._execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self._count('fresh_hits')
+            self._count('bytes_saved', len(body))
+            return body
+
+        headers = {}
+        if body is not None:
+            if cached[2]:
+                headers['If-None-Match'] = cached[2]
+            if cached[3]:
+                headers['If-Modified-Since'] = cached[3]
+
+        try:
+            with self._get(url, headers) as response:
+                if response.status_code == 304 and body is not None:
+                    self._execute(
+                        "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+                    )
+                    self._count('revalidated')
+                    self._count('bytes_saved', len(body))
+                    return body
+
+                if response.status_code != 200:
+                    self._count('errors')
+                    return None
+
+                content_type = response.headers.get('Content-Type')
+                if not is_html(content_type):
+                    self._count('skipped')
+                    return None
+
+                body = self._read_response(response)
+        except requests.exceptions.RequestException:
+            self._count('errors')
+            return None
+
+        if body is None:
+            self._count('skipped')
+            return None
+        if not body:
+            self._count('errors')
+            return None
+
+        body_hash = self._write_body(body)
+        self._execute('''
+            INSERT OR REPLACE INTO responses
+            (url, body_hash, size, content_type, etag, last_modified, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            url, body_hash, len(body), content_type,
+            response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now
+        ))
+        self._count('misses')
+        self._count('bytes_downloaded', len(body))
+        return body
+
+    def decode_url(self, source_url: str, decoder) -> str:
+        """Google News URL 디코딩 결과 캐시 (실패 시 None, 실패 결과는 저장하지 않음)"""
+        self._count('decode_requests')
+        rows = self._execute("SELECT decoded_url FROM decoded_urls WHERE source_url = ?", (source_url,))
+        if rows:
+            self._count('decode_hits')
+            return rows[0][0]
+
+        result = decoder(source_url)
+        if not result or not result.get('status') or not result.get('decoded_url'):
+            return None
+
+        self._execute(
+            "INSERT OR REPLACE INTO decoded_urls (source_url, decoded_url, created_at) VALUES (?, ?, ?)",
+            (source_url, result['decoded_url'], time.time())
+        )
+        return result['decoded_url']
+
+    def evict(self):
+        """오래된 항목 삭제 후 용량 초과 시 오래 사용하지 않은 순으로 삭제"""
+        now = time.time()
+        self._execute("DELETE FROM responses WHERE fetched_at < ?", (now - self.max_age_seconds,))
+        self._execute("DELETE FROM decoded_urls WHERE created_at < ?", (now - self.max_age_seconds,))
+
+        # 본문 파일 기준 용량 (같은 본문을 여러 URL이 공유하면 한 번만 계산)
+        rows = self._execute('''
+            SELECT body_hash, MAX(size), MAX(accessed_at) FROM responses
+            GROUP BY body_hash ORDER BY MAX(accessed_at) ASC
+        ''')
+        total_size = sum(row[1] for row in rows)
+        for body_hash, size, _ in rows:
+            if total_size <= self.max_bytes:
+                break
+            self._execute("DELETE FROM responses WHERE body_hash = ?", (body_hash,))
+            total_size -= size
+
+        # 참조되지 않는 본문 파일 삭제
+        referenced = {row[0] for row in self._execute("SELECT DISTINCT body_hash FROM responses")}
+        removed = 0
+        for root, _, files in os.walk(self.bodies_dir):
+            for name in files:
+                if name not in referenced:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+
+        print(f"HTTP 캐시 정리: 본문 {len(referenced)}개 유지 ({total_size / 1024 / 1024:.1f}MB), {removed}개 삭제")
+
+    def report(self):
+        """실행 단위 캐시 통계 출력"""
+        stats = self.stats
+        hits = stats['fresh_hits'] + stats['revalidated']
+        hit_ratio = hits / stats['requests'] if stats['requests'] else 0
+        print(
+            f"HTTP 캐시: 요청 {stats['requests']}개, 적중 {hits}개 "
+            f"(신선 {stats['fresh_hits']}, 재검증 {stats['revalidated']}), 적중률 {hit_ratio:.0%}, "
+            f"절약 {stats['bytes_saved'] / 1024:.1f}KB, 다운로드 {stats['bytes_downloaded'] / 1024:.1f}KB, "
+            f"제외(비HTML/용량 초과) {stats['skipped']}개, 오류 {stats['errors']}개"
+        )
+        print(f"URL 디코딩 캐시: {stats['decode_hits']}/{stats['decode_requests']}개 적중")
@@ -0,0 +1,374 @@
+import os
+import json
+import glob
+import argparse
+import hashlib
+import heapq
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List
+
+
+# 형태소 분석 결과로 저장하는 품사 (일반명사, 고유명사, 외국어(SMR, ESS 등), 동사)
+MORPHOLOGY_TAGS = ('NNG', 'NNP', 'SL', 'VV')
+# 유사도 그룹화에 쓰는 품사 (외국어 제외)
+GROUPING_TAGS = ('NNG', 'NNP', 'VV')
+# 키워드 집계에 쓰는 품사 (동사 제외)
+TERM_TAGS = ('NNG', 'NNP', 'SL')
+# 월별 요약(summary.json)에 보관하는 상위 용어 수
+SUMMARY_TOP_TERMS = 1000
+
+
+def tag_morphology(kiwi, text: str) -> str:
+    """형태소 분석 ('형태/품사' 공백 구분 문자열 반환, 용도별로 filter_tokens 사용)"""
+    tokens = kiwi.analyze(text)
+    return ' '.join(f"{token[0]}/{token[1]}" for token in tokens[0][0] if token[1] in MORPHOLOGY_TAGS)
+
+
+def filter_tokens(tagged: str, tags: tuple) -> List[str]:
+    """tag_morphology 결과에서 지정 품사의 형태만 추출"""
+    words = []
+    for token in tagged.split():
+        form, _, tag = token.rpartition('/')
+        if tag in tags:
+            words.append(form)
+    return words
+
+
+class NewsAnalytics:
+    """월별 아카이브 키워드/토픽/언론사 집계
+
+    data/analytics/YYYY-MM.json에 월별 사전 집계(원본)를 저장하고, 조회용으로
+    - summary.json: 월별 기사 수, 토픽/언론사 수, 상위 용어
+    - terms/XX.json: 용어 해시 기준 256개 샤드, {용어: {월: 기사 수}}
+    를 함께 갱신해 조회 시 월별 전체 용어 사전을 읽지 않음.
+    terms는 해당 용어가 등장한 기사 수 (기사당 1회).
+    """
+
+    def __init__(self, data_dir: str = 'data', kiwi=None):
+        self.data_dir = data_dir
+        self.stats_dir = os.path.join(data_dir, 'analytics')
+        self.terms_dir = os.path.join(self.stats_dir, 'terms')
+        self.summary_path = os.path.join(self.stats_dir, 'summary.json')
+        self.kiwi = kiwi
+        self._cache = {}
+        self._summary = None
+        self._shards = {}
+        self._dirty_shards = set()
+
+    def _get_kiwi(self):
+        """Kiwi는 월 전체 재집계가 필요할 때만 생성"""
+        if self.kiwi is None:
+            from kiwipiepy import Kiwi
+            self.kiwi = Kiwi()
+        return self.kiwi
+
+    def _stats_path(self, month: str) -> str:
+        return os.path.join(self.stats_dir, f"{month}.json")
+
+    @staticmethod
+    def _empty_stats(month: str) -> Dict:
+        return {
+            "month": month,
+            "article_count": 0,
+            "topics": {},
+            "press_by_topic": {},
+            "terms": {}
+        }
+
+    def _add_article(self, stats: Dict, article: Dict):
+        """기사 한 건을 집계에 반영 (tokens(tag_morphology 결과)가 있으면 재사용)"""
+        topic = article.get('topic') or ''
+        press = article.get('press') or ''
+        tokens = article.get('tokens')
+        if tokens is None:
+            tokens = tag_morphology(self._get_kiwi(), article.get('content') or '')
+
+        stats['article_count'] += 1
+        stats['topics'][topic] = stats['topics'].get(topic, 0) + 1
+        press_counts = stats['press_by_topic'].setdefault(topic, {})
+        press_counts[press] = press_counts.get(press, 0) + 1
+        for term in set(filter_tokens(tokens, TERM_TAGS)):
+            stats['terms'][term] = stats['terms'].get(term, 0) + 1
+
+    def load_month(self, month: str) -> Dict:
+        """월별 집계 로드 (없으면 None)"""
+        if month in self._cache:
+            return self._cache[month]
+
+        path = self._stats_path(month)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        self._cache[month] = stats
+        return stats
+
+    def save_month(self, stats: Dict, changed_terms: set = None, flush: bool = True):
+        """월별 집계 저장 (압축 JSON) 후 요약과 용어 샤드 갱신
+
+        changed_terms가 주어지면 해당 용어의 샤드만 갱신, 없으면 이 월의 모든 샤드 항목을 다시 기록.
+        여러 월을 연속 저장할 때는 flush=False로 모아 두고 마지막에 flush_index() 호출
+        """
+        os.makedirs(self.stats_dir, exist_ok=True)
+        with open(self._stats_path(stats['month']), 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, separators=(',', ':'))
+        self._cache[stats['month']] = stats
+
+        summary = self.load_summary()
+        summary[stats['month']] = {
+            "article_count": stats['article_count'],
+            "topics": stats['topics'],
+            "press_by_topic": stats['press_by_topic'],
+            "term_count": len(stats['terms']),
+            "top_terms": Counter(stats['terms']).most_common(SUMMARY_TOP_TERMS)
+        }
+        self._update_term_shards(stats, changed_terms)
+        if flush:
+            self.flush_index()
+
+    def flush_index(self):
+        """요약과 변경된 용어 샤드 기록"""
+        os.makedirs(self.terms_dir, exist_ok=True)
+        for key in sorted(self._dirty_shards):
+            with open(os.path.join(self.terms_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+                json.dump(self._shards[key], f, ensure_ascii=False, separators=(',', ':'))
+        self._dirty_shards.clear()
+
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.load_summary(), f, ensure_ascii=False, separators=(',', ':'))
+
+    @staticmethod
+    def _shard_key(term: str) -> str:
+        return hashlib.md5(term.encode('utf-8')).hexdigest()[:2]
+
+    def _load_shard(self, key: str) -> Dict[str, Dict[str, int]]:
+        if key not in self._shards:
+            path = os.path.join(self.terms_dir, f"{key}.json")
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._shards[key] = json.load(f)
+            else:
+                self._shards[key] = {}
+        return self._shards[key]
+
+    def _update_term_shards(self, stats: Dict, changed_terms: set = None):
+        """용어 샤드(메모리)에 이 월의 기사 수 반영"""
+        month = stats['month']
+        if changed_terms is None:
+            # 전체 재기록: 모든 샤드에서 이 월 항목을 지우고 다시 기록
+            keys = {f"{i:02x}" for i in range(256)}
+            terms = stats['terms'].keys()
+        else:
+            keys = {self._shard_key(term) for term in changed_terms}
+            terms = changed_terms
+
+        by_shard = {}
+        for term in terms:
+            by_shard.setdefault(self._shard_key(term), []).append(term)
+
+        for key in keys:
+            shard = self._load_shard(key)
+            if changed_terms is None:
+                for term in [t for t, months in shard.items() if month in months]:
+                    del shard[term][month]
+                    if not shard[term]:
+                        del shard[term]
+            for term in by_shard.get(key, []):
+                shard.setdefault(term, {})[month] = stats['terms'][term]
+        self._dirty_shards.update(keys)
+
+    def load_summary(self) -> Dict[str, Dict]:
+        """월별 요약 로드 ({월: 요약}), 없으면 기존 월별 집계로 요약과 용어 샤드 생성"""
+        if self._summary is None:
+            if os.path.exists(self.summary_path):
+                with open(self.summary_path, 'r', encoding='utf-8') as f:
+                    self._summary = json.load(f)
+            else:
+                self._summary = {}
+                stats_files = sorted(glob.glob(os.path.join(self.stats_dir, "????-??.json")))
+                for stats_file in stats_files:
+                    self.save_month(self.load_month(os.path.basename(stats_file).replace('.json', '')), flush=False)
+                self.flush_index()
+        return self._summary
+
+    def rebuild_month(self, month: str, flush: bool = True) -> Dict:
+        """월별 JSON 전체를 다시 읽어 집계"""
+        with open(os.path.join(self.data_dir, f"{month}.json"), 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+
+        stats = self._empty_stats(month)
+        for article in articles:
+            self._add_article(stats, article)
+        self.save_month(stats, flush=flush)
+        return stats
+
+    def update_month(self, month: str, new_articles: List[Dict], total_count: int) -> Dict:
+        """신규 기사만 기존 집계에 추가
+
+        total_count(월별 JSON의 전체 기사 수)와 집계 기사 수가 맞지 않으면
+        (집계 파일 없음, 이전 갱신 누락 등) 해당 월을 전체 재집계
+        """
+        stats = self.load_month(month)
+        if stats is None or stats['article_count'] + len(new_articles) != total_count:
+            print(f"분석 집계 재생성: {month}")
+            return self.rebuild_month(month)
+
+        before = dict(stats['terms'])
+        for article in new_articles:
+            self._add_article(stats, article)
+        changed_terms = {term for term, count in stats['terms'].items() if before.get(term) != count}
+        self.save_month(stats, changed_terms)
+        return stats
+
+    def rebuild(self, months: List[str] = None):
+        """전체(또는 지정 월) 집계 재생성"""
+        months = months or self.archive_months()
+        for month in months:
+            stats = self.rebuild_month(month, flush=False)
+            print(f"분석 집계 완료: {month} ({stats['article_count']}개 기사, {len(stats['terms'])}개 용어)")
+        self.flush_index()
+
+    def archive_months(self) -> List[str]:
+        """월별 JSON이 있는 월 목록 (오름차순)"""
+        monthly_files = sorted(glob.glob(os.path.join(self.data_dir, "????-??.json")))
+        return [os.path.basename(f).replace('.json', '') for f in monthly_files]
+
+    def _months_in_range(self, start: str = None, end: str = None) -> List[tuple]:
+        """기간(YYYY-MM, 양끝 포함) 내 (월, 요약) 목록"""
+        return [
+            (month, summary) for month, summary in sorted(self.load_summary().items())
+            if (start is None or month >= start) and (end is None or month <= end)
+        ]
+
+    def term_counts(self, terms: List[str], start: str = None, end: str = None) -> Dict[str, Dict[str, int]]:
+        """월별 용어 언급 기사 수 ({월: {용어: 기사 수}}, 용어별 샤드 파일만 읽음)"""
+        term_months = {term: self._load_shard(self._shard_key(term)).get(term, {}) for term in terms}
+        return {
+            month: {term: term_months[term].get(month, 0) for term in terms}
+            for month, _ in self._months_in_range(start, end)
+        }
+
+    def topic_counts(self, start: str = None, end: str = None) -> Dict[str, Dict[str, int]]:
+        """월별 토픽 기사 수 ({월: {토픽: 기사 수}})"""
+        return {month: summary['topics'] for month, summary in self._months_in_range(start, end)}
+
+    def top_press(self, topic: str = None, limit: int = 10, start: str = None, end: str = None) -> List[tuple]:
+        """기간 내 언론사별 기사 수 상위 목록 (topic 미지정 시 전체 토픽)"""
+        counts = Counter()
+        for _, summary in self._months_in_range(start, end):
+            for topic_name, press_counts in summary['press_by_topic'].items():
+                if topic is None or topic_name == topic:
+                    counts.update(press_counts)
+        return counts.most_common(limit)
+
+    def top_terms(self, limit: int = 50, start: str = None, end: str = None) -> List[tuple]:
+        """기간 내 언급 기사 수 상위 용어
+
+        월별 상위 목록(summary.json)으로 후보와 기사 수 상한을 구해 후보만 용어 샤드에서 정확히 집계.
+        목록 밖 용어가 상위에 들 수 있으면(월별 목록 최솟값의 합 이상) 월별 집계 파일 전체로 계산
+        """
+        months = self._months_in_range(start, end)
+        counts = Counter()
+        covered = Counter()
+        missing_max = 0
+        for _, summary in months:
+            top = summary['top_terms']
+            # 목록에 없는 용어의 이 월 기사 수 상한 (목록이 월 전체 용어면 0)
+            cutoff = top[-1][1] if top and summary['term_count'] > len(top) else 0
+            missing_max += cutoff
+            for term, count in top:
+                counts[term] += count
+                covered[term] += cutoff
+
+        # 상한이 큰 후보부터 샤드에서 정확한 기사 수를 구하고, limit번째 값이 남은 후보의 상한 이상이면 확정
+        month_names = {month for month, _ in months}
+        exact = Counter()
+        top_counts = []  # 지금까지 정확히 집계한 기사 수 중 상위 limit개 (최소 힙)
+        for term in sorted(counts, key=lambda t: counts[t] + missing_max - covered[t], reverse=True):
+            if len(top_counts) >= limit and top_counts[0] >= counts[term] + missing_max - covered[term]:
+                break
+            term_months = self._load_shard(self._shard_key(term)).get(term, {})
+            exact[term] = sum(count for month, count in term_months.items() if month in month_names)
+            heapq.heappush(top_counts, exact[term])
+            if len(top_counts) > limit:
+                heapq.heappop(top_counts)
+
+        result = exact.most_common(limit)
+        if len(result) == limit and result[-1][1] >= missing_max or missing_max == 0:
+            return result
+
+        counts = Counter()
+        for month, _ in months:
+            counts.update(self.load_month(month)['terms'])
+        return counts.most_common(limit)
+
+    def export(self, output_path: str, terms_per_month: int = 100, press_per_topic: int = 10):
+        """아카이브 사이트용 압축 JSON 내보내기 (월별 토픽 수, 상위 용어, 토픽별 상위 언론사)"""
+        months = []
+        for month, summary in self._months_in_range():
+            months.append({
+                "month": month,
+                "article_count": summary['article_count'],
+                "topics": summary['topics'],
+                "top_terms": summary['top_terms'][:terms_per_month],
+                "top_press": {
+                    topic: Counter(press_counts).most_common(press_per_topic)
+                    for topic, press_counts in summary['press_by_topic'].items()
+                }
+            })
+
+        export_data = {
+            "months": months,
+            "last_updated": datetime.now().isoformat()
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(export_data, f, ensure_ascii=False, separators=(',', ':'))
+
+        print(f"분석 데이터 내보내기 완료: {output_path} ({len(months)}개월)")
+
+
+def main():
+    """분석 집계 생성/조회 명령행 도구"""
+    parser = argparse.ArgumentParser(description="월별 아카이브 키워드/토픽 분석")
+    parser.add_argument('--data-dir', default='data', help="월별 JSON 폴더")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild_parser = subparsers.add_parser('rebuild', help="집계 재생성")
+    rebuild_parser.add_argument('months', nargs='*', help="재생성할 월 (YYYY-MM, 미지정 시 전체)")
+
+    terms_parser = subparsers.add_parser('terms', help="월별 용어 언급 기사 수")
+    terms_parser.add_argument('terms', nargs='+')
+
+    subparsers.add_parser('topics', help="월별 토픽 기사 수")
+
+    press_parser = subparsers.add_parser('press', help="언론사별 기사 수 상위 목록")
+    press_parser.add_argument('--topic')
+    press_parser.add_argument('--limit', type=int, default=10)
+
+    export_parser = subparsers.add_parser('export', help="아카이브 사이트용 JSON 내보내기")
+    export_parser.add_argument('--output', default=None, help="출력 경로 (기본: <data-dir>/analytics.json)")
+
+    for sub in (terms_parser, press_parser):
+        sub.add_argument('--start', help="시작 월 (YYYY-MM)")
+        sub.add_argument('--end', help="종료 월 (YYYY-MM)")
+
+    args = parser.parse_args()
+    analytics = NewsAnalytics(args.data_dir)
+
+    if args.command == 'rebuild':
+        analytics.rebuild(args.months)
+    elif args.command == 'terms':
+        result = analytics.term_counts(args.terms, args.start, args.end)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.command == 'topics':
+        print(json.dumps(analytics.topic_counts(), ensure_ascii=False, indent=2))
+    elif args.command == 'press':
+        result = analytics.top_press(args.topic, args.limit, args.start, args.end)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.command == 'export':
+        analytics.export(args.output or os.path.join(args.data_dir, 'analytics.json'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import os
+import json
+import glob
+import mmap
+import time
+import struct
+import hashlib
+import argparse
+from typing import Dict, Iterator, List
+import zstandard
+
+
+# 인덱스 항목: URL 해시(8바이트) + 세그먼트 내 오프셋(8바이트) + 압축 길이(4바이트)
+INDEX_ENTRY = struct.Struct('<QQI')
+
+
+def url_hash(url: str) -> int:
+    """URL 해시 (인덱스 키)"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ArchiveStore:
+    """월별 기사 아카이브 저장소
+
+    월마다 세그먼트(YYYY-MM.jsonl.zst)와 인덱스(YYYY-MM.idx) 파일 한 쌍으로 구성.
+    세그먼트는 기사 한 건(JSON 한 줄)씩 독립된 zstd 프레임으로 이어 붙여
+    추가(append)만 하고, 인덱스의 오프셋으로 월 전체를 읽지 않고 한 건만 읽음.
+    """
+
+    def __init__(self, archive_dir: str = 'data/archive', level: int = 10):
+        self.archive_dir = archive_dir
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+        self._indexes = {}
+
+    def _segment_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"{month}.jsonl.zst")
+
+    def _index_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"{month}.idx")
+
+    def months(self) -> List[str]:
+        """저장된 월 목록 (오름차순)"""
+        index_files = sorted(glob.glob(os.path.join(self.archive_dir, "????-??.idx")))
+        return [os.path.basename(f).replace('.idx', '') for f in index_files]
+
+    def _load_index(self, month: str) -> Dict[int, tuple]:
+        """월별 인덱스 로드 ({URL 해시: (오프셋, 길이)}, 추가 순서 유지)"""
+        if month in self._indexes:
+            return self._indexes[month]
+
+        index = {}
+        path = self._index_path(month)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            # 기록 도중 중단된 마지막 항목은 무시
+            usable = len(data) - len(data) % INDEX_ENTRY.size
+            for key, offset, length in INDEX_ENTRY.iter_unpack(data[:usable]):
+                index[key] = (offset, length)
+        self._indexes[month] = index
+        return index
+
+    def count(self, month: str) -> int:
+        """월별 기사 수 (인덱스만 읽음)"""
+        return len(self._load_index(month))
+
+    def contains(self, url: str, month: str) -> bool:
+        return url_hash(url) in self._load_index(month)
+
+    def _repair(self, month: str, index: Dict[int, tuple]):
+        """중단된 기록의 잔여 바이트 제거 (인덱스의 불완전한 마지막 항목, 인덱스에 없는 세그먼트 끝 프레임)"""
+        index_path = self._index_path(month)
+        if os.path.exists(index_path):
+            size = os.path.getsize(index_path)
+            if size % INDEX_ENTRY.size:
+                os.truncate(index_path, size - size % INDEX_ENTRY.size)
+
+        segment_path = self._segment_path(month)
+        if os.path.exists(segment_path):
+            end = max((offset + length for offset, length in index.values()), default=0)
+            if os.path.getsize(segment_path) > end:
+                os.truncate(segment_path, end)
+
+    def append(self, month: str, articles: List[Dict]) -> int:
+        """신규 기사 추가 (URL 기준 중복 제외), 추가된 기사 수 반환"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        index = self._load_index(month)
+        self._repair(month, index)
+
+        entries = []
+        with open(self._segment_path(month), 'ab') as segment:
+            offset = segment.tell()
+            for article in articles:
+                key = url_hash(article['original_url'])
+                if key in index:
+                    continue
+                line = json.dumps(article, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                frame = self.compressor.compress(line)
+                segment.write(frame)
+                index[key] = (offset, len(frame))
+                entries.append(INDEX_ENTRY.pack(key, offset, len(frame)))
+                offset += len(frame)
+            segment.flush()
+            os.fsync(segment.fileno())
+
+        # 세그먼트를 먼저 기록한 뒤 인덱스 추가 (중단 시 남은 잔여 바이트는 다음 append에서 _repair로 제거)
+        if entries:
+            with open(self._index_path(month), 'ab') as f:
+                f.write(b''.join(entries))
+        return len(entries)
+
+    def _open_segment(self, month: str):
+        path = self._segment_path(month)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None, None
+        f = open(path, 'rb')
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, url: str, month: str = None) -> Dict:
+        """URL로 기사 한 건 조회 (월 지정 시 해당 월만, 없으면 None)"""
+        key = url_hash(url)
+        for candidate in ([month] if month else reversed(self.months())):
+            entry = self._load_index(candidate).get(key)
+            if entry is None:
+                continue
+
+            f, segment = self._open_segment(candidate)
+            if segment is None:
+                continue
+            try:
+                offset, length = entry
+                article = json.loads(self.decompressor.decompress(segment[offset:offset + length]))
+            finally:
+                segment.close()
+                f.close()
+            if article.get('original_url') == url:
+                return article
+        return None
+
+    def iter_month(self, month: str) -> Iterator[Dict]:
+        """월별 기사 순회 (추가 순서, 한 건씩 압축 해제)"""
+        index = self._load_index(month)
+        if not index:
+            return
+
+        f, segment = self._open_segment(month)
+        if segment is None:
+            return
+        try:
+            for offset, length in index.values():
+                yield json.loads(self.decompressor.decompress(segment[offset:offset + length]))
+        finally:
+            segment.close()
+            f.close()
+
+    def iter_all(self) -> Iterator[Dict]:
+        """전체 기사 순회 (월 오름차순)"""
+        for month in self.months():
+            yield from self.iter_month(month)
+
+    def import_json(self, json_path: str) -> int:
+        """data/YYYY-MM.json을 아카이브로 변환 (이미 있는 URL은 건너뜀)"""
+        month = os.path.basename(json_path).replace('.json', '')
+        with open(json_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        return self.append(month, articles)
+
+    def export_json(self, month: str, json_path: str) -> int:
+        """아카이브를 기존 형식의 data/YYYY-MM.json으로 변환"""
+        articles = list(self.iter_month(month))
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(articles, f, ensure_ascii=False, indent=4)
+        return len(articles)
+
+
+def benchmark(data_dir: str, store: ArchiveStore):
+    """기존 월별 JSON과 아카이브의 디스크 사용량/로드 시간 비교"""
+    print(f"{'월':<8} {'JSON(KB)':>10} {'아카이브(KB)':>12} {'비율':>6} {'JSON 로드(ms)':>14} {'순회(ms)':>10} {'URL 조회(ms)':>13}")
+    total_json = total_archive = 0
+
+    for json_path in sorted(glob.glob(os.path.join(data_dir, "????-??.json"))):
+        month = os.path.basename(json_path).replace('.json', '')
+        if store.count(month) == 0:
+            continue
+
+        json_size = os.path.getsize(json_path)
+        archive_size = os.path.getsize(store._segment_path(month)) + os.path.getsize(store._index_path(month))
+        total_json += json_size
+        total_archive += archive_size
+
+        start = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        json_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in store.iter_month(month):
+            pass
+        iter_ms = (time.perf_counter() - start) * 1000
+
+        url = articles[-1]['original_url']
+        lookup_store = ArchiveStore(store.archive_dir)
+        start = time.perf_counter()
+        lookup_store.get(url, month)
+        lookup_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{month:<8} {json_size / 1024:>10.1f} {archive_size / 1024:>12.1f} "
+              f"{archive_size / json_size:>6.0%} {json_ms:>14.1f} {iter_ms:>10.1f} {lookup_ms:>13.2f}")
+
+    if total_json:
+        print(f"전체: JSON {total_json / 1024:.1f}KB → 아카이브 {total_archive / 1024:.1f}KB ({total_archive / total_json:.0%})")
+
+
+def main():
+    """아카이브 변환/조회 명령행 도구"""
+    parser = argparse.ArgumentParser(description="월별 기사 아카이브 저장소")
+    parser.add_argument('--data-dir', default='data', help="월별 JSON 폴더")
+    parser.add_argument('--archive-dir', default=None, help="아카이브 폴더 (기본: <data-dir>/archive)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="월별 JSON → 아카이브 변환")
+    import_parser.add_argument('months', nargs='*', help="변환할 월 (YYYY-MM, 미지정 시 전체)")
+
+    export_parser = subparsers.add_parser('export', help="아카이브 → 월별 JSON 변환")
+    export_parser.add_argument('months', nargs='*', help="변환할 월 (YYYY-MM, 미지정 시 전체)")
+
+    get_parser = subparsers.add_parser('get', help="URL로 기사 조회")
+    get_parser.add_argument('url')
+
+    subparsers.add_parser('benchmark', help="디스크 사용량/로드 시간 비교")
+
+    args = parser.parse_args()
+    store = ArchiveStore(args.archive_dir or os.path.join(args.data_dir, 'archive'))
+
+    if args.command == 'import':
+        months = args.months or [
+            os.path.basename(f).replace('.json', '')
+            for f in sorted(glob.glob(os.path.join(args.data_dir, "????-??.json")))
+        ]
+        for month in months:
+            added = store.import_json(os.path.join(args.data_dir, f"{month}.json"))
+            print(f"아카이브 변환: {month} (+{added}개, 총 {store.count(month)}개)")
+    elif args.command == 'export':
+        for month in args.months or store.months():
+            count = store.export_json(month, os.path.join(args.data_dir, f"{month}.json"))
+            print(f"JSON 변환: {month} ({count}개)")
+    elif args.command == 'get':
+        article = store.get(args.url)
+        print(json.dumps(article, ensure_ascii=False, indent=4) if article else "기사를 찾을 수 없습니다.")
+    elif args.command == 'benchmark':
+        benchmark(args.data_dir, store)
+
+
+if __name__ == "__main__":
+    main()
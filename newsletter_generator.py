@@ -1,11 +1,14 @@
 import os
+import sys
+import argparse
 import yaml
 import json
 import glob
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import trafilatura
+from trafilatura.utils import decode_file
 from gnews import GNews
 from langchain_openai import ChatOpenAI
 from googlenewsdecoder import new_decoderv1
@@ -15,24 +18,42 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from kiwipiepy import Kiwi
 from newspaper import Article
+from news_analytics import NewsAnalytics, GROUPING_TAGS, tag_morphology, filter_tokens
+try:
+    from news_archive import ArchiveStore
+except ImportError:  # zstandard 미설치 시 아카이브 없이 월별 JSON만 사용
+    ArchiveStore = None
+from http_cache import HttpCache
 import requests
 import locale
-import ssl
 import sqlite3
 import concurrent.futures
 import threading
+from collections import Counter
+
+
+# 기사별 파이프라인 단계 (순서대로 진행, run_articles.stage에 마지막 완료 단계 기록)
+PIPELINE_STAGES = ('collected', 'extracted', 'tokenized', 'grouped', 'summarized', 'rendered')
+RUN_ARTICLE_FIELDS = (
+    'topic', 'source_url', 'search_keyword', 'title', 'press', 'date', 'original_url',
+    'content', 'image_url', 'tokens', 'group_id', 'group_rank', 'summary',
+    'stage', 'status', 'error'
+)
+SUMMARY_FAILED = "요약 생성 실패"
 
 
 class NewsletterGenerator:
     """단일 뉴스레터 생성 클래스"""
 
-    def __init__(self, name: str, config: Dict, common_config: Dict):
+    def __init__(self, name: str, config: Dict, common_config: Dict, http_cache: HttpCache = None):
         self.name = name
         self.config = config
         self.common = common_config
+        self.http_cache = http_cache or HttpCache.from_config(common_config)  # 뉴스레터 간 공유 가능
         self.kiwi = Kiwi()  # 한 번만 생성
         self.all_collected_urls = set()
         self.url_lock = threading.Lock()  # 스레드 안전한 URL 집합을 위한 락
+        self.topic_configs = {topic['name']: topic for topic in config['topics']}
 
         load_dotenv()
         try:
@@ -40,119 +61,377 @@ class NewsletterGenerator:
         except locale.Error:
             print(f"로케일 설정 실패, 기본 로케일 사용")
 
-    def generate(self):
-        """뉴스레터 생성 메인 로직"""
+    def generate(self, run_id: str = None) -> bool:
+        """뉴스레터 생성 메인 로직 (단계별 체크포인트, 같은 run_id로 재실행 시 중단 지점부터 재개)
+
+        실패 기사 없이 HTML까지 완료하면 True, 재시도가 필요하면(partial) False 반환
+        """
+        self.run_id = run_id or (datetime.now() + timedelta(hours=9)).strftime("%Y%m%d%H%M%S")
+
         print(f"\n{'='*60}")
-        print(f"뉴스레터 생성: {self.name}")
+        print(f"뉴스레터 생성: {self.name} (run_id: {self.run_id})")
         print(f"{'='*60}")
 
-        all_news = []
+        self.init_pipeline_db()
+        self.prune_runs(self.common.get('run_retention_days', 7))
+        articles = self.load_run_articles()
+        if articles:
+            print(f"이전 실행 재개: {len(articles)}개 기사 상태 로드")
+
+        # 이미 본문을 수집한 URL은 중복 체크 대상에 포함
+        self.all_collected_urls.update(
+            a['original_url'] for a in articles
+            if a['status'] != 'skipped' and self._reached(a, 'extracted')
+        )
+
+        # 1. collected: 토픽별 뉴스 검색 (완료된 토픽은 건너뜀)
+        articles.extend(self.collect_stage())
+
+        # 2. extracted: URL 디코딩, 본문/이미지 수집
+        self.extract_stage(articles)
+        all_news = [a for a in articles if a['status'] != 'skipped' and self._reached(a, 'extracted')]
+
+        # 3. tokenized: 품사 태그 포함 형태소 분석 (그룹화와 월별 분석 집계에서 품사별로 재사용)
+        self.tokenize_stage(all_news)
+
+        # DB 저장
+        if all_news:
+            self.save_to_db(all_news)
+            self.export_to_json()
+
+            # 월별 JSON 업데이트 (energy 뉴스레터만)
+            if self.config.get('monthly_json_enabled'):
+                self.update_monthly_json(all_news)
+
+        # 4. grouped / 5. summarized
+        self.group_stage(all_news)
+        self.summarize_stage(all_news)
+
+        # 6. rendered: HTML 생성
+        rendered = self.render_stage(all_news)
+
+        failed = [a for a in articles if a['status'] == 'failed']
+        completed = rendered and not failed
+        self.update_run_status('completed' if completed else 'partial')
+        if not completed:
+            print(f"실패 기사 {len(failed)}개 - 'python newsletter_generator.py --run-id {self.run_id}'로 재시도 가능")
 
-        # 병렬로 토픽별 뉴스 수집
+        print(f"\n뉴스레터 생성 완료: {self.config['output_html']}")
+        return completed
+
+    @staticmethod
+    def _reached(article: Dict, stage: str) -> bool:
+        """기사가 해당 단계를 완료했는지 여부"""
+        return PIPELINE_STAGES.index(article['stage']) >= PIPELINE_STAGES.index(stage)
+
+    @staticmethod
+    def _mark(article: Dict, stage: str = None, error: str = None):
+        """단계 결과 기록 (error가 있으면 실패, 단계는 그대로 유지)"""
+        if error:
+            article['status'] = 'failed'
+            article['error'] = error
+        else:
+            article['stage'] = stage
+            article['status'] = 'ok'
+            article['error'] = None
+
+    def collect_stage(self) -> List[Dict]:
+        """토픽별 검색 결과를 collected 단계로 저장"""
+        done_topics = self.load_topic_status()
+        pending_topics = [t for t in self.config['topics'] if t['name'] not in done_topics]
+        collected = []
+
+        # 병렬로 토픽별 뉴스 검색
         with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
             future_to_topic = {
                 executor.submit(self.collect_news, topic): topic
-                for topic in self.config['topics']
+                for topic in pending_topics
             }
 
             for future in concurrent.futures.as_completed(future_to_topic):
                 topic = future_to_topic[future]
                 try:
-                    news_list = future.result()
+                    news_items = future.result()
                     print(f"\n토픽 수집: {topic['name']}")
 
-                    # topic 정보 추가
-                    for news in news_list:
-                        news['topic'] = topic['name']
-                        news['search_keyword'] = ' OR '.join(topic['keywords'])
-
-                    all_news.extend(news_list)
-                    print(f"수집된 뉴스: {len(news_list)}개")
+                    topic_articles = {}
+                    for item in news_items:
+                        # URL이 없는 항목만 제외 (나머지 필드는 없으면 빈 값)
+                        if not item.get('url'):
+                            continue
+                        topic_articles.setdefault(item['url'], {
+                            'topic': topic['name'],
+                            'source_url': item['url'],
+                            'search_keyword': ' OR '.join(topic['keywords']),
+                            'title': item.get('title') or '',
+                            'press': (item.get('publisher') or {}).get('title') or '',
+                            'date': item.get('published date') or '',
+                            'original_url': None,
+                            'content': None,
+                            'image_url': '',
+                            'tokens': None,
+                            'group_id': None,
+                            'group_rank': None,
+                            'summary': '',
+                            'stage': 'collected',
+                            'status': 'ok',
+                            'error': None
+                        })
+
+                    self.save_run_articles(list(topic_articles.values()), done_topic=topic['name'])
+                    collected.extend(topic_articles.values())
+                    print(f"검색된 뉴스: {len(topic_articles)}개")
                 except Exception as e:
                     print(f"토픽 '{topic['name']}' 수집 실패: {str(e)}")
 
-        # DB 저장
-        if all_news:
-            self.save_to_db(all_news)
-            self.export_to_json()
+        return collected
+
+    def extract_stage(self, articles: List[Dict]):
+        """collected 단계 기사의 본문 수집 (실패 기사만 재시도)"""
+        pending = [a for a in articles if a['status'] != 'skipped' and a['stage'] == 'collected']
+        if not pending:
+            return
+
+        # 본문 수집 전 필터 (제목, 언론사)
+        rejected = Counter()
+        for article in pending:
+            rule = self.check_quality(article, 'collected')
+            if rule:
+                article['status'] = 'skipped'
+                article['error'] = f"필터: {rule}"
+                rejected[rule] += 1
+        self.save_run_articles([a for a in pending if a['status'] == 'skipped'])
+        pending = [a for a in pending if a['status'] != 'skipped']
+
+        interval_time = self.common.get('interval_time', 5)
+        extracted_count = 0
+
+        # 병렬로 뉴스 본문 수집
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            future_to_article = {
+                executor.submit(self._fetch_article_content, article, interval_time): article
+                for article in pending
+            }
 
-            # 월별 JSON 업데이트 (energy 뉴스레터만)
-            if self.config.get('monthly_json_enabled'):
-                self.update_monthly_json(all_news)
+            for future in concurrent.futures.as_completed(future_to_article):
+                article = future_to_article[future]
+                article.update(future.result())
+                self.save_run_articles([article])
+                if article['status'] == 'ok':
+                    extracted_count += 1
+                elif article['status'] == 'skipped' and article['error'].startswith('필터: '):
+                    rejected[article['error'][len('필터: '):]] += 1
+
+        print(f"본문 수집: {extracted_count}/{len(pending)}개 성공")
+        if rejected:
+            print("품질 필터 제외: " + ", ".join(f"{rule} {count}개" for rule, count in rejected.most_common()))
+
+    def _quality_setting(self, topic_name: str, key: str, default):
+        """품질 필터 설정 조회 (토픽 설정이 공통 설정보다 우선)"""
+        topic_config = self.topic_configs.get(topic_name, {})
+        if key in topic_config:
+            return topic_config[key]
+        return self.common.get(key, default)
+
+    def check_quality(self, article: Dict, stage: str) -> Optional[str]:
+        """품질 필터 검사, 제외 사유(규칙 이름) 반환 (통과 시 None)
+
+        - collected 단계: 본문 수집 전 언론사 차단 목록, 제목 스팸 키워드(spam_keywords)
+        - extracted 단계: 최소 본문 길이, 본문 스팸 키워드(spam_body_keywords)
+        allowed_publishers에 포함된 언론사는 모든 규칙을 건너뜀
+        """
+        topic_name = article['topic']
+        press = article.get('press') or ''
+        if press in (self._quality_setting(topic_name, 'allowed_publishers', []) or []):
+            return None
 
-        # HTML 생성
-        html = self.generate_html(all_news)
-        self.save_html(html)
+        if stage == 'collected':
+            if press in (self._quality_setting(topic_name, 'blocked_publishers', []) or []):
+                return 'blocked_publishers'
+            spam_keywords = [kw.lower() for kw in (self._quality_setting(topic_name, 'spam_keywords', []) or [])]
+            title = (article.get('title') or '').lower()
+            if any(kw in title for kw in spam_keywords):
+                return 'title_spam'
+        elif stage == 'extracted':
+            content = article.get('content') or ''
+            min_length = self._quality_setting(topic_name, 'min_content_length', 0) or 0
+            if len(content) < min_length:
+                return 'min_content_length'
+            body_keywords = [kw.lower() for kw in (self._quality_setting(topic_name, 'spam_body_keywords', []) or [])]
+            content = content.lower()
+            if any(kw in content for kw in body_keywords):
+                return 'content_spam'
+
+        return None
+
+    def tokenize_stage(self, articles: List[Dict]):
+        """extracted 단계 기사의 형태소 분석 결과 저장"""
+        pending = [a for a in articles if a['stage'] == 'extracted']
+        for article in pending:
+            try:
+                article['tokens'] = tag_morphology(self.kiwi, article['content'])
+                self._mark(article, 'tokenized')
+            except Exception as e:
+                self._mark(article, error=f"형태소 분석 실패: {str(e)}")
 
-        print(f"\n뉴스레터 생성 완료: {self.config['output_html']}")
+        if pending:
+            self.save_run_articles(pending)
+
+    def group_stage(self, articles: List[Dict]):
+        """토픽별 유사도 그룹화 (새로 추가된 기사가 있는 토픽만 다시 계산)"""
+        for topic_config in self.config['topics']:
+            topic_news = [a for a in articles if a['topic'] == topic_config['name']]
+            if all(self._reached(a, 'grouped') for a in topic_news):
+                continue
+
+            tokenized = [a for a in topic_news if self._reached(a, 'tokenized')]
+            untokenized = [a for a in topic_news if not self._reached(a, 'tokenized')]
+            try:
+                groups = self.group_articles_with_similarity(tokenized) if tokenized else []
+            except Exception as e:
+                print(f"토픽 '{topic_config['name']}' 그룹화 실패: {str(e)}")
+                for article in tokenized:
+                    self._mark(article, error=f"그룹화 실패: {str(e)}")
+                groups = [[article] for article in tokenized]
+            # 형태소 분석에 실패한 기사는 단독 그룹으로 표시
+            groups.extend([article] for article in untokenized)
+
+            for group_id, group in enumerate(groups):
+                for group_rank, article in enumerate(group):
+                    article['group_id'] = group_id
+                    article['group_rank'] = group_rank
+                    if article['status'] == 'failed' and not self._reached(article, 'grouped'):
+                        continue
+                    # 대표 기사가 바뀌어 요약이 없으면 요약 단계부터 다시 진행
+                    needs_summary = group_rank == 0 and article['summary'] in ('', None, SUMMARY_FAILED)
+                    if not self._reached(article, 'grouped') or needs_summary:
+                        self._mark(article, 'grouped')
+
+            self.save_run_articles(topic_news)
+
+    def summarize_stage(self, articles: List[Dict]):
+        """grouped 단계 대표 기사 요약 (요약이 없는 기사만 API 호출)"""
+        done = []
+        to_summarize = []
+        for article in articles:
+            if article['stage'] != 'grouped':
+                continue
+            if article['group_rank'] != 0 or article['summary'] not in ('', None, SUMMARY_FAILED):
+                self._mark(article, 'summarized')
+                done.append(article)
+            else:
+                to_summarize.append(article)
+        self.save_run_articles(done)
+
+        # 병렬로 요약 생성
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            summary_futures = {
+                executor.submit(self.summarize_content, article['content']): article
+                for article in to_summarize
+            }
+
+            for future in concurrent.futures.as_completed(summary_futures):
+                article = summary_futures[future]
+                try:
+                    article['summary'] = future.result()
+                except Exception:
+                    article['summary'] = SUMMARY_FAILED
+
+                if article['summary'] == SUMMARY_FAILED:
+                    self._mark(article, error=SUMMARY_FAILED)
+                else:
+                    self._mark(article, 'summarized')
+                self.save_run_articles([article])
+
+    def render_stage(self, articles: List[Dict]) -> bool:
+        """HTML 생성 후 요약까지 완료된 기사를 rendered로 기록 (HTML 저장 실패 시 False)"""
+        html = self.generate_html(articles)
+        if not self.save_html(html):
+            return False
+
+        rendered = [a for a in articles if a['status'] == 'ok' and a['stage'] == 'summarized']
+        for article in rendered:
+            self._mark(article, 'rendered')
+        self.save_run_articles(rendered)
+        return True
 
     def collect_news(self, topic: Dict) -> List[Dict]:
-        """토픽의 키워드로 뉴스 수집"""
+        """토픽의 키워드로 뉴스 검색"""
         keywords_combined = topic['keywords'][0] if len(topic['keywords']) == 1 else ' OR '.join(topic['keywords'])
         return self.get_news(keywords_combined)
 
-    def _fetch_article_content(self, item: Dict, interval_time: int) -> Dict:
-        """개별 뉴스 본문 수집 (병렬 처리용 헬퍼 함수)"""
-        try:
-            title = item['title']
-            source_url = item['url']
-            decoded_url = new_decoderv1(source_url, interval=interval_time)
-            original_url = decoded_url['decoded_url']
+    def _fetch_article_content(self, article: Dict, interval_time: int) -> Dict:
+        """개별 뉴스 본문 수집 (병렬 처리용 헬퍼 함수)
 
-            # 중복 URL 체크 (스레드 안전)
+        URL은 품질 필터를 통과한 기사만 선점하므로, 한 토픽의 규칙으로 제외된 URL도
+        다른 토픽에서 규칙을 통과하면 수집됨 (같은 본문은 HTTP 캐시에서 재사용)
+        """
+        article = dict(article)
+        try:
+            original_url = self.http_cache.decode_url(
+                article['source_url'],
+                lambda url: new_decoderv1(url, interval=interval_time)
+            )
+            if not original_url:
+                self._mark(article, error='URL 디코딩 실패')
+                return article
+            article['original_url'] = original_url
+
+            # 이미 다른 기사가 선점한 URL은 본문 수집 없이 제외
             with self.url_lock:
                 if original_url in self.all_collected_urls:
-                    return None
-                # 본문 수집 전에 미리 추가하여 중복 수집 방지
-                temp_added = True
-                self.all_collected_urls.add(original_url)
-
-            press = item['publisher']['title']
-            date = item['published date']
+                    article['status'] = 'skipped'
+                    article['error'] = '중복 URL'
+                    return article
 
-            # 본문 수집
-            downloaded = trafilatura.fetch_url(original_url)
-            content = trafilatura.extract(downloaded)
+            # 본문 수집 (HTTP 캐시 경유, 인코딩 판별은 trafilatura에 맡기고 이미지 추출에서도 같은 HTML 재사용)
+            body = self.http_cache.fetch(original_url)
+            downloaded = decode_file(body) if body else None
+            content = trafilatura.extract(downloaded) if downloaded else None
 
             if not content:
-                # 본문이 없으면 URL 제거
-                with self.url_lock:
-                    self.all_collected_urls.discard(original_url)
-                return None
+                self._mark(article, error='본문 없음')
+                return article
+
+            # 본문 수집 직후 필터 (길이, 스팸), 제외되면 이미지 수집 생략
+            article['content'] = content
+            rule = self.check_quality(article, 'extracted')
+            if rule:
+                article['status'] = 'skipped'
+                article['error'] = f"필터: {rule}"
+                return article
+
+            # 필터를 통과한 기사만 URL 선점 (스레드 안전)
+            with self.url_lock:
+                if original_url in self.all_collected_urls:
+                    article['status'] = 'skipped'
+                    article['error'] = '중복 URL'
+                    return article
+                self.all_collected_urls.add(original_url)
 
             # 이미지 URL 추출
             main_image = ''
             try:
-                original_context = ssl._create_default_https_context
-                ssl._create_default_https_context = ssl._create_unverified_context
-
-                article = Article(original_url)
-                article.download()
-                article.parse()
-                main_image = article.top_image
+                news_article = Article(original_url)
+                news_article.download(input_html=downloaded)
+                news_article.parse()
+                main_image = news_article.top_image
 
                 if main_image and main_image.startswith('http:'):
                     main_image = main_image.replace('http:', 'https:', 1)
             except Exception:
                 pass
-            finally:
-                ssl._create_default_https_context = original_context
-
-            return {
-                'title': title,
-                'original_url': original_url,
-                'press': press,
-                'date': date,
-                'content': content,
-                'summary': '',
-                'image_url': main_image
-            }
 
-        except Exception:
-            return None
+            article['image_url'] = main_image
+            self._mark(article, 'extracted')
+            return article
+
+        except Exception as e:
+            self._mark(article, error=str(e) or type(e).__name__)
+            return article
 
     def get_news(self, keyword: str) -> List[Dict]:
-        """GNews API로 뉴스 검색 및 수집"""
+        """GNews API로 뉴스 검색 (실패 시 예외 발생, 토픽은 재시도 대상으로 남음)"""
         period = self.common.get('period', '일단위')
 
         if period == "일단위":
@@ -164,28 +443,130 @@ class NewsletterGenerator:
         else:
             when = "1d"
 
-        try:
-            gnews = GNews(language='ko', country='KR', period=when, max_results=10)
-            news_items = gnews.get_news(keyword)
-            interval_time = self.common.get('interval_time', 5)
-
-            # 병렬로 뉴스 본문 수집
-            news_list = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_item = {
-                    executor.submit(self._fetch_article_content, item, interval_time): item
-                    for item in news_items
-                }
-
-                for future in concurrent.futures.as_completed(future_to_item):
-                    result = future.result()
-                    if result:
-                        news_list.append(result)
-
-            return news_list
-        except Exception as e:
-            print(f"뉴스 검색 실패: {str(e)}")
-            return []
+        gnews = GNews(language='ko', country='KR', period=when, max_results=10)
+        return gnews.get_news(keyword)
+
+    def init_pipeline_db(self):
+        """실행(run) 단위 체크포인트 테이블 생성"""
+        db_name = self.config['db_name']
+        conn = sqlite3.connect(db_name)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                status TEXT,
+                started_at TEXT,
+                updated_at TEXT
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS run_topics (
+                run_id TEXT,
+                topic TEXT,
+                PRIMARY KEY (run_id, topic)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS run_articles (
+                run_id TEXT,
+                topic TEXT,
+                source_url TEXT,
+                search_keyword TEXT,
+                title TEXT,
+                press TEXT,
+                date TEXT,
+                original_url TEXT,
+                content TEXT,
+                image_url TEXT,
+                tokens TEXT,
+                group_id INTEGER,
+                group_rank INTEGER,
+                summary TEXT,
+                stage TEXT,
+                status TEXT,
+                error TEXT,
+                PRIMARY KEY (run_id, topic, source_url)
+            )
+        ''')
+
+        now = datetime.now().isoformat()
+        cursor.execute('''
+            INSERT OR IGNORE INTO runs (run_id, status, started_at, updated_at)
+            VALUES (?, 'running', ?, ?)
+        ''', (self.run_id, now, now))
+        cursor.execute("UPDATE runs SET status = 'running', updated_at = ? WHERE run_id = ?", (now, self.run_id))
+
+        conn.commit()
+        conn.close()
+
+    def load_run_articles(self) -> List[Dict]:
+        """현재 run_id의 기사별 진행 상태 로드"""
+        conn = sqlite3.connect(self.config['db_name'])
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT {', '.join(RUN_ARTICLE_FIELDS)} FROM run_articles WHERE run_id = ? ORDER BY rowid",
+            (self.run_id,)
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(zip(RUN_ARTICLE_FIELDS, row)) for row in rows]
+
+    def load_topic_status(self) -> set:
+        """현재 run_id에서 검색을 마친 토픽 이름 집합"""
+        conn = sqlite3.connect(self.config['db_name'])
+        cursor = conn.cursor()
+        cursor.execute("SELECT topic FROM run_topics WHERE run_id = ?", (self.run_id,))
+        topics = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return topics
+
+    def save_run_articles(self, articles: List[Dict], done_topic: str = None):
+        """기사별 진행 상태 저장 (done_topic이 주어지면 같은 트랜잭션에서 토픽 검색 완료 기록)"""
+        conn = sqlite3.connect(self.config['db_name'])
+        cursor = conn.cursor()
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO run_articles (run_id, {', '.join(RUN_ARTICLE_FIELDS)}) "
+            f"VALUES (?, {', '.join('?' * len(RUN_ARTICLE_FIELDS))})",
+            [(self.run_id, *(article[field] for field in RUN_ARTICLE_FIELDS)) for article in articles]
+        )
+        if done_topic:
+            cursor.execute(
+                "INSERT OR IGNORE INTO run_topics (run_id, topic) VALUES (?, ?)",
+                (self.run_id, done_topic)
+            )
+        conn.commit()
+        conn.close()
+
+    def update_run_status(self, status: str):
+        """실행 상태 갱신 (running, partial, completed)"""
+        conn = sqlite3.connect(self.config['db_name'])
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+            (status, datetime.now().isoformat(), self.run_id)
+        )
+        conn.commit()
+        conn.close()
+
+    def prune_runs(self, retention_days: int):
+        """보존 기간이 지난 completed 실행의 체크포인트 삭제 (본문/토큰이 쌓이지 않도록)"""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        conn = sqlite3.connect(self.config['db_name'])
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT run_id FROM runs WHERE status = 'completed' AND updated_at < ? AND run_id != ?",
+            (cutoff, self.run_id)
+        )
+        run_ids = [(row[0],) for row in cursor.fetchall()]
+        cursor.executemany("DELETE FROM run_articles WHERE run_id = ?", run_ids)
+        cursor.executemany("DELETE FROM run_topics WHERE run_id = ?", run_ids)
+        cursor.executemany("DELETE FROM runs WHERE run_id = ?", run_ids)
+        conn.commit()
+        conn.close()
+
+        if run_ids:
+            print(f"오래된 실행 체크포인트 삭제: {len(run_ids)}개")
 
     def save_to_db(self, news_list: List[Dict]):
         """뉴스 리스트를 SQLite DB에 저장"""
@@ -294,7 +675,7 @@ class NewsletterGenerator:
 
         # 중복 제거 (URL 기반)
         existing_urls = {article['original_url'] for article in existing_data}
-        new_count = 0
+        added_articles = []
 
         for article in new_articles:
             if article['original_url'] not in existing_urls:
@@ -308,18 +689,40 @@ class NewsletterGenerator:
                     "content": article['content']
                 })
                 existing_urls.add(article['original_url'])
-                new_count += 1
+                added_articles.append(article)
 
         # 저장
         with open(monthly_path, 'w', encoding='utf-8') as f:
             json.dump(existing_data, f, ensure_ascii=False, indent=4)
 
-        print(f"월별 JSON 업데이트: {monthly_path} (+{new_count}개, 총 {len(existing_data)}개)")
+        print(f"월별 JSON 업데이트: {monthly_path} (+{len(added_articles)}개, 총 {len(existing_data)}개)")
+
+        # 압축 아카이브에 추가 (이미 있는 URL은 건너뛰므로 아카이브에 없던 기존 기사도 함께 채워짐)
+        archive_ok = False
+        archive_dir = self.config.get('monthly_archive_dir')
+        if archive_dir and ArchiveStore is None:
+            print("zstandard 미설치로 아카이브 업데이트 건너뜀 (월별 JSON으로 집계)")
+        elif archive_dir:
+            try:
+                archive = ArchiveStore(archive_dir)
+                archived = archive.append(year_month, existing_data)
+                archive_ok = True
+                print(f"아카이브 업데이트: {archive_dir}/{year_month}.jsonl.zst (+{archived}개, 총 {archive.count(year_month)}개)")
+            except Exception as e:
+                print(f"아카이브 업데이트 중 오류 발생 (월별 JSON으로 집계): {str(e)}")
 
-        # index.json 업데이트
-        self.update_index_json(monthly_dir)
+        # index.json 업데이트 (아카이브 실패 시 월별 JSON으로 기사 수 계산)
+        self.update_index_json(monthly_dir, use_archive=archive_ok)
+
+        # 월별 분석 집계 업데이트 (현재 월만, 신규 기사만 추가)
+        try:
+            analytics = NewsAnalytics(monthly_dir, self.kiwi)
+            analytics.update_month(year_month, added_articles, len(existing_data))
+            analytics.export(f"{monthly_dir}/analytics.json")
+        except Exception as e:
+            print(f"분석 집계 업데이트 중 오류 발생: {str(e)}")
 
-    def update_index_json(self, data_dir: str):
+    def update_index_json(self, data_dir: str, use_archive: bool = True):
         """data/index.json 업데이트 (웹사이트용 메타데이터)"""
         index_path = f"{data_dir}/index.json"
 
@@ -327,9 +730,18 @@ class NewsletterGenerator:
         monthly_files = sorted(glob.glob(f"{data_dir}/????-??.json"), reverse=True)
         months = [os.path.basename(f).replace('.json', '') for f in monthly_files]
 
-        # 전체 기사 수 계산
+        # 전체 기사 수 계산 (아카이브에 있는 월은 인덱스만 읽음)
+        archive_dir = self.config.get('monthly_archive_dir')
+        archive = ArchiveStore(archive_dir) if archive_dir and use_archive and ArchiveStore else None
         total_count = 0
-        for month_file in monthly_files:
+        for month_file, month in zip(monthly_files, months):
+            try:
+                archived_count = archive.count(month) if archive else 0
+            except Exception:
+                archived_count = 0
+            if archived_count:
+                total_count += archived_count
+                continue
             with open(month_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 total_count += len(data)
@@ -348,9 +760,7 @@ class NewsletterGenerator:
 
     def analyze_morphology(self, text: str) -> str:
         """형태소 분석 (명사, 동사 추출)"""
-        tokens = self.kiwi.analyze(text)
-        words = [token[0] for token in tokens[0][0] if token[1] in ('NNG', 'NNP', 'VV')]
-        return ' '.join(words)
+        return ' '.join(filter_tokens(tag_morphology(self.kiwi, text), GROUPING_TAGS))
 
     def group_articles_with_similarity(self, articles: List[Dict]) -> List[List[Dict]]:
         """유사도 기반 기사 그룹화"""
@@ -358,7 +768,11 @@ class NewsletterGenerator:
         if not valid_articles:
             return [[article] for article in articles]
 
-        texts = [self.analyze_morphology(article['content']) for article in valid_articles]
+        texts = [
+            ' '.join(filter_tokens(article['tokens'], GROUPING_TAGS)) if article.get('tokens')
+            else self.analyze_morphology(article['content'])
+            for article in valid_articles
+        ]
 
         if not texts:
             return [[article] for article in articles]
@@ -405,7 +819,7 @@ class NewsletterGenerator:
             answer = chain.invoke({"topic": content})
             return answer
         except Exception:
-            return "요약 생성 실패"
+            return SUMMARY_FAILED
 
     def generate_html(self, all_news: List[Dict]) -> str:
         """HTML 뉴스레터 생성"""
@@ -505,34 +919,16 @@ class NewsletterGenerator:
                 newsletter_html += f"<p>오늘은 '{topic_name}' 관련 뉴스가 없습니다.</p></div>"
                 continue
 
-            grouped_articles = self.group_articles_with_similarity(topic_news)
-
-            # 병렬로 요약 생성
-            articles_to_summarize = []
-            for group in grouped_articles:
-                if group:
-                    articles_to_summarize.append(group[0])
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                summary_futures = {
-                    executor.submit(self.summarize_content, article['content']): article
-                    for article in articles_to_summarize
-                }
-
-                summary_map = {}
-                for future in concurrent.futures.as_completed(summary_futures):
-                    article = summary_futures[future]
-                    try:
-                        summary_map[id(article)] = future.result()
-                    except Exception:
-                        summary_map[id(article)] = "요약 생성 실패"
+            # 그룹화/요약 단계에서 저장된 결과 사용
+            grouped_articles = {}
+            for article in sorted(topic_news, key=lambda a: (a['group_id'], a['group_rank'])):
+                grouped_articles.setdefault(article['group_id'], []).append(article)
 
             # HTML 생성 (요약 결과 사용)
-            summary_idx = 0
-            for group in grouped_articles:
+            for group in grouped_articles.values():
                 for article_idx, article in enumerate(group):
                     if article_idx == 0:
-                        summary = summary_map.get(id(article), "요약 생성 실패")
+                        summary = article.get('summary') or SUMMARY_FAILED
                         newsletter_html += f"""
                             <div style="display: flex; flex-direction: row; gap: 0px; padding: 20px 0px 10px 0px; align-items: flex-start; justify-content: flex-start; align-self: stretch; position: relative;">
                                 <div style="display: flex; flex-direction: column; gap: 10px; align-items: flex-start; justify-content: flex-start; flex: 1; position: relative;">
@@ -586,19 +982,25 @@ class NewsletterGenerator:
 
         return newsletter_html
 
-    def save_html(self, html_content: str):
+    def save_html(self, html_content: str) -> bool:
         """HTML 파일 저장"""
         try:
             file_path = self.config['output_html']
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(html_content)
             print(f"HTML 저장 완료: {file_path}")
+            return True
         except Exception as e:
             print(f"HTML 파일 저장 중 오류 발생: {str(e)}")
+            return False
 
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="뉴스레터 생성")
+    parser.add_argument('--run-id', help="실행 ID (같은 ID로 재실행하면 중단된 단계부터 재개)")
+    args = parser.parse_args()
+
     # config.yaml 로드
     config_path = 'config.yaml'
     if not os.path.exists(config_path):
@@ -608,15 +1010,26 @@ def main():
     with open(config_path, 'r', encoding='utf-8') as f:
         config = yaml.safe_load(f)
 
-    # 각 뉴스레터 생성
+    # 각 뉴스레터 생성 (HTTP 캐시는 모든 뉴스레터가 공유)
+    http_cache = HttpCache.from_config(config['common'])
+    partial = []
     for name, nl_config in config['newsletters'].items():
-        generator = NewsletterGenerator(name, nl_config, config['common'])
-        generator.generate()
+        generator = NewsletterGenerator(name, nl_config, config['common'], http_cache)
+        if not generator.generate(run_id=args.run_id):
+            partial.append(name)
+
+    http_cache.report()
+    http_cache.evict()
 
     print("\n" + "="*60)
     print("모든 뉴스레터 생성 완료!")
     print("="*60)
 
+    # HTML은 생성됐지만 실패 기사가 남은 경우 재실행(같은 run_id)으로 재개할 수 있도록 실패 코드로 종료
+    if partial:
+        print(f"일부 실패: {', '.join(partial)} - 같은 --run-id로 재실행하면 실패 항목만 다시 처리")
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()